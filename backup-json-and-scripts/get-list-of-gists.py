@@ -1,9 +1,16 @@
-import requests
+import asyncio
+import aiohttp
 import os
+import shelve
 import sys
-import json
+from collections import deque
+from itertools import islice
+import orjson
+from pathlib import Path
 from pprint import pprint
 
+from gist_http import RETRY_TOTAL, is_retryable, retry_delay
+
 # Get GitHub token from environment variable
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
@@ -16,93 +23,174 @@ HEADERS = {
     "Accept": "application/vnd.github.v3+json"
 }
 
-def fetch_secret_gists():
-    page = 1
+# Upper bound on in-flight raw_url downloads (and pooled connections)
+MAX_CONCURRENCY = 20
+
+# Downloads scheduled ahead of the record being written; bounds finished-but-unwritten
+# records (and their content) held in memory when an early file is slow
+FETCH_WINDOW = 2 * MAX_CONCURRENCY
+
+# On-disk cache of raw_url -> (etag, content) so unchanged files come back as 304s
+GIST_CACHE_FILE = ".gist_cache"
+
+# Gist names tracked in gist-ids.json look like "<0001|0002>-storage-<iac>"
+STORAGE_GIST_PREFIXES = ("0001-storage-", "0002-storage-")
+
+# Base delay for listing/raw_url retries when GitHub gives no Retry-After hint
+RETRY_BACKOFF = 0.5
+
+# Connection errors are retried too; the last attempt's error or response is returned as is
+async def get_with_retry(session, url, headers=None):
+    for attempt in range(RETRY_TOTAL + 1):
+        try:
+            response = await session.get(url, headers=headers)
+        except aiohttp.ClientError:
+            if attempt == RETRY_TOTAL:
+                raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+            continue
+        if attempt == RETRY_TOTAL or not is_retryable(response.status, response.headers):
+            return response
+        delay = retry_delay(response.headers, attempt, RETRY_BACKOFF)
+        response.release()
+        await asyncio.sleep(delay)
+
+# Returns one page of the gist listing and the last page number advertised by
+# GitHub's Link header (rel="last"); a failed page raises ClientResponseError so
+# an incomplete listing never replaces the existing backup
+async def fetch_gist_page(session, page, per_page):
+    url = f"https://api.github.com/gists?per_page={per_page}&page={page}"
+    async with await get_with_retry(session, url) as response:
+        if response.status != 200:
+            print(f"❌ Failed to fetch gists (page {page}): {response.status}")
+            print(await response.text())
+            response.raise_for_status()
+
+        last = response.links.get("last")
+        last_page = int(last["url"].query.get("page", page)) if last else page
+        return await response.json(), last_page
+
+async def fetch_raw(session, sem, cache, gist, filename, file_info):
+    raw_url = file_info.get("raw_url")
+    content = None
+    if raw_url:
+        cached = cache.get(raw_url)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        async with sem:
+            async with await get_with_retry(session, raw_url, headers) as content_response:
+                if content_response.status == 304:
+                    content = cached[1]
+                elif content_response.status == 200:
+                    content = await content_response.text()
+                    etag = content_response.headers.get("ETag")
+                    if etag:
+                        cache[raw_url] = (etag, content)
+                # Any other status leaves content as None
+
+        # Decode JSON content here, once; leave it as a string if it isn't JSON
+        if content is not None:
+            try:
+                content = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+    return {
+        "id": gist["id"],
+        "filename": filename,
+        "description": gist.get("description", ""),
+        "content": content,
+        "operation": "fetched",
+        "raw_url": raw_url
+    }
+
+# Streams every secret gist file record into `out` as a JSON array, in listing
+# order, and returns the number of records written along with the storage gist ids
+async def fetch_secret_gists(out):
     per_page = 100
-    secret_gists = []
-
-    while True:
-        url = f"https://api.github.com/gists?per_page={per_page}&page={page}"
-        response = requests.get(url, headers=HEADERS)
-
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch gists: {response.status_code}")
-            print(response.json())
-            break
-
-        gists = response.json()
-        if not gists:
-            break
-
-        for gist in gists:
-            if not gist.get("public", True):
-                gist_id = gist["id"]
-                description = gist.get("description", "")
-                files = gist.get("files", {})
-
-                for filename, file_info in files.items():
-                    raw_url = file_info.get("raw_url")
-                    content = None
-                    if raw_url:
-                        content_response = requests.get(raw_url, headers=HEADERS)
-                        if content_response.status_code == 200:
-                            content = content_response.text
-                        else:
-                            # content = f"[Failed to fetch content: {content_response.status_code}]"
-                            try:
-                                content = json.loads(content)  # Ensure content is JSON serializable
-                                content = {
-                                    "schemaVersion": content.get("schemaVersion", None),
-                                    "label": content.get("label",None),
-                                    "message": content.get("message",None),
-                                    "color": content.get("color",None),
-                                    "style": content.get("style",None)
-                                }
-                            except json.JSONDecodeError:
-                                content = f"[Content not JSON serializable]"
-                                content = {}
-
-                    secret_gists.append({
-                        "id": gist_id,
-                        "filename": filename,
-                        "description": description,
-                        "content": content,
-                        "operation": "fetched",
-                        "raw_url": raw_url
-                    })
-
-        page += 1
-
-    return secret_gists
+    file_count = 0
+    gist_ids = {}
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, ttl_dns_cache=300)
+
+    out.write(b"[")
+    with shelve.open(GIST_CACHE_FILE) as cache:
+        async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+            # The first page tells us how many there are; list the rest in parallel
+            gists, last_page = await fetch_gist_page(session, 1, per_page)
+            pages = [gists]
+            if last_page > 1:
+                rest = await asyncio.gather(
+                    *(fetch_gist_page(session, page, per_page) for page in range(2, last_page + 1))
+                )
+                pages.extend(page_gists for page_gists, _ in rest)
+
+            # Download every secret file across all pages through a sliding window of
+            # at most FETCH_WINDOW tasks; records are written in listing order and
+            # the window is refilled as each one is written out
+            targets = (
+                (gist, filename, file_info)
+                for gists in pages
+                for gist in gists
+                if not gist.get("public", True)
+                for filename, file_info in gist.get("files", {}).items()
+            )
+            seen = set()
+            window = deque(
+                asyncio.create_task(fetch_raw(session, sem, cache, *target))
+                for target in islice(targets, FETCH_WINDOW)
+            )
+            try:
+                while window:
+                    record = await window.popleft()
+                    for target in islice(targets, 1):
+                        window.append(asyncio.create_task(fetch_raw(session, sem, cache, *target)))
+
+                    out.write(b",\n" if file_count else b"\n")
+                    out.write(orjson.dumps(record, option=orjson.OPT_INDENT_2))
+                    file_count += 1
+                    seen.add(record["raw_url"])
+
+                    gist_name = record["filename"].split(".")[0]
+                    if gist_name.startswith(STORAGE_GIST_PREFIXES) and gist_name.count("-") == 2:
+                        gist_ids[gist_name] = {
+                            "id": record["id"],
+                            "raw_url": record["raw_url"]
+                        }
+            finally:
+                # Don't leave downloads running if a record failed
+                for task in window:
+                    task.cancel()
+
+            # raw_urls embed the revision SHA, so anything not listed this run
+            # belongs to an old revision or a deleted gist
+            for raw_url in set(cache) - seen:
+                del cache[raw_url]
+
+    out.write(b"\n]" if file_count else b"]")
+
+    return file_count, gist_ids
 
 if __name__ == "__main__":
-    gists = fetch_secret_gists()
-    gist_ids = {}
-    if gists:
-        print(f"🔐 Found {len(gists)} secret gist file(s):")
-        # Convert stringified JSON in 'content' to dicts where possible
-        for gist in gists:
-            content = gist.get("content")
-            if isinstance(content, str):
-                try:
-                    gist["content"] = json.loads(content)
-                except Exception:
-                    pass  # Leave as string if not valid JSON
-
-        for gist in gists:
-            gist_name = gist.get("filename", "").split(".")[0]
-            if len(gist_name.split("-")) == 3 and gist_name.split("-")[0] in ["0001","0002"] and gist_name.split("-")[1] == "storage":
-                gist_ids[gist_name] = {
-                    "id": gist.get("id"),
-                    "raw_url": gist.get("raw_url", "")
-                }
-
-        with open("all-gists.json", "w") as f:
-            json.dump(gists, f, indent=2, ensure_ascii=False)
+    # Stream into a temp file and only swap it over the existing backup once the
+    # run succeeded and actually found gists
+    tmp_file = "all-gists.json.tmp"
+    try:
+        with open(tmp_file, "wb") as out:
+            file_count, gist_ids = asyncio.run(fetch_secret_gists(out))
+        if file_count:
+            os.replace(tmp_file, "all-gists.json")
+    except aiohttp.ClientResponseError as e:
+        print(f"❌ Gist listing failed ({e.status}); all-gists.json left untouched.")
+        sys.exit(1)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    if file_count:
+        print(f"🔐 Found {file_count} secret gist file(s):")
         print("\n📂 Gists written to all-gists.json")
 
-        with open("gist-ids.json", "w") as f:
-            json.dump(gist_ids, f, indent=2, ensure_ascii=False)
+        Path("gist-ids.json").write_bytes(orjson.dumps(gist_ids, option=orjson.OPT_INDENT_2))
         print("📂 Gist IDs written to gist-ids.json")
     else:
         print("ℹ️ No secret gists found.")
\ No newline at end of file
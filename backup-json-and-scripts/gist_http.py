@@ -0,0 +1,25 @@
+import time
+
+# Retry policy shared by the backup scripts; each script picks its own backoff base
+RETRY_TOTAL = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Takes the status and headers rather than a response so it works for both
+# aiohttp (response.status) and httpx (response.status_code).
+# A 403 is only retryable when GitHub marks it as a (secondary) rate limit
+def is_retryable(status, headers):
+    if status in RETRY_STATUSES:
+        return True
+    return status == 403 and (
+        "Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+# Prefer GitHub's own hint (Retry-After seconds, then X-RateLimit-Reset epoch) over backoff
+def retry_delay(headers, attempt, backoff):
+    retry_after = headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return int(retry_after)
+    reset = headers.get("X-RateLimit-Reset", "")
+    if headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        return max(int(reset) - time.time(), 0)
+    return backoff * 2 ** attempt
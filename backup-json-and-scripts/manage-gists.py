@@ -1,6 +1,11 @@
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 import os
+from aiolimiter import AsyncLimiter
+from pathlib import Path
+
+from gist_http import RETRY_TOTAL, is_retryable, retry_delay
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 HEADERS = {
@@ -8,61 +13,149 @@ HEADERS = {
     "Accept": "application/vnd.github.v3+json"
 }
 
+GISTS_URL = "https://api.github.com/gists"
+
+# Cap on in-flight API calls, kept low to respect GitHub's secondary rate limits
+MAX_CONCURRENCY = 10
+
+# Token bucket for request starts: ~80/min is a safe burst under GitHub's secondary limits
+RATE_LIMIT = 80
+RATE_PERIOD = 60
+
+# Base delay for create/update/delete retries; the limiter already paces request starts
+RETRY_BACKOFF = 0.3
+
 INPUT_FILE = "gists.json"
+OUTPUT_FILE = "all-gists.json"
 OUTPUT_MAPPING = {}
-UPDATED_ENTRIES = []
 
-with open(INPUT_FILE, "r") as f:
-    gist_entries = json.load(f)
+def jdumps(obj, pretty=False):
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
 
-for entry in gist_entries:
+# Timeouts and dropped connections are retried too; the last attempt's error propagates
+async def request_with_retry(client, limiter, method, url, **kwargs):
+    for attempt in range(RETRY_TOTAL + 1):
+        try:
+            async with limiter:
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == RETRY_TOTAL:
+                raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+            continue
+        if attempt == RETRY_TOTAL or not is_retryable(response.status_code, response.headers):
+            return response
+        await asyncio.sleep(retry_delay(response.headers, attempt, RETRY_BACKOFF))
+
+# Request builders: each returns (method, url, json body) for one entry, or None
+# when the entry lacks what the operation needs (update/delete require an id)
+def build_create(entry, gist_id, filename):
+    content_str = jdumps(entry.get("content", {}), pretty=True)
+    payload = {
+        "description": f"Gist for {filename}",
+        "public": False,
+        "files": {filename: {"content": content_str}}
+    }
+    return "POST", GISTS_URL, payload
+
+def build_update(entry, gist_id, filename):
+    if not gist_id:
+        return None
+    content_str = jdumps(entry.get("content", {}), pretty=True)
+    payload = {
+        "files": {filename: {"content": content_str}}
+    }
+    return "PATCH", f"{GISTS_URL}/{gist_id}", payload
+
+def build_delete(entry, gist_id, filename):
+    if not gist_id:
+        return None
+    return "DELETE", f"{GISTS_URL}/{gist_id}", None
+
+# operation -> (request builder, expected success status, success message)
+OPS = {
+    "create": (build_create, 201, "✅ Created Gist"),
+    "update": (build_update, 200, "🔄 Updated Gist"),
+    "delete": (build_delete, 204, "🗑️ Deleted Gist"),
+}
 
+# Applies one entry's operation and returns the entry to keep in all-gists.json,
+# or None if it was deleted, skipped or the call failed
+async def handle(entry, client, sem, limiter):
     operation = entry.get("operation", "").lower()
     gist_id = entry.get("id", None)
     if operation == "fetched":
-        UPDATED_ENTRIES.append(entry)
-    elif operation == "create":
+        return entry
+
+    op = OPS.get(operation)
+    if op is None:
+        return None
+    build, expected_status, message = op
+    filename = entry.get("filename")
+    spec = build(entry, gist_id, filename)
+    if spec is None:
+        return None
+    if operation == "create":
         print(f"Creating Gist: {entry}")
-        payload = {
-            "description": f"Gist for {entry.get('filename')}",
-            "public": False,
-            "files": {
-                entry.get("filename"): {
-                    "content": json.dumps(entry.get("content", {}), indent=2)
-                }
-            }
-        }
-        response = requests.post("https://api.github.com/gists", headers=HEADERS, json=payload)
-        if response.status_code == 201:
-            gist_data = response.json()
-            file_info = list(gist_data["files"].values())[0]
-            entry.update({"id": gist_data["id"], "description": gist_data["description"], "raw_url": file_info["raw_url"], "operation": "fetched"})
-            UPDATED_ENTRIES.append(entry)
-            print(f"✅ Created Gist: {gist_data['html_url']}")
-    elif operation == "delete" and gist_id:
-        response = requests.delete(f"https://api.github.com/gists/{gist_id}", headers=HEADERS)
-        if response.status_code == 204:
-            print(f"🗑️ Deleted Gist with ID: {gist_id}")
-        else:
-            print(f"❌ Failed to delete Gist for {name}: {response.status_code}")
-            print(response.json())
-    elif operation == "update" and gist_id:
-        payload = {
-            "files": {
-                entry.get("filename"): {
-                    "content": json.dumps(entry.get("content", {}), indent=2)
-                }
-            }
-        }
-        response = requests.patch(f"https://api.github.com/gists/{gist_id}", headers=HEADERS, json=payload)
-        if response.status_code == 200:
-            gist_data = response.json()
-            file_info = list(gist_data["files"].values())[0]
-            entry.update({"id": gist_data["id"], "description": gist_data["description"], "raw_url": file_info["raw_url"], "operation": "fetched"})
-            UPDATED_ENTRIES.append(entry)
-            print(f"🔄 Updated Gist: {gist_data['html_url']}")
-
-with open("all-gists.json", "w") as f:
-    json.dump(UPDATED_ENTRIES, f, indent=2, ensure_ascii=False)
-
-print("\n📂 Gists written to all-gists.json")
\ No newline at end of file
+    method, url, payload = spec
+
+    try:
+        async with sem:
+            response = await request_with_retry(client, limiter, method, url, json=payload)
+    except httpx.HTTPError as e:
+        print(f"❌ Network error during Gist {operation} for {filename}: {e}")
+        return None
+
+    if response.status_code != expected_status:
+        print(f"❌ Failed to {operation} Gist for {filename}: {response.status_code}")
+        print(response.text)
+        return None
+    if operation == "delete":
+        print(f"{message} with ID: {gist_id}")
+        return None
+
+    gist_data = response.json()
+    # GitHub may normalise the filename; fall back to the gist's only file
+    file_info = gist_data["files"].get(filename) or next(iter(gist_data["files"].values()))
+    entry.update({"id": gist_data["id"], "description": gist_data["description"], "raw_url": file_info["raw_url"], "operation": "fetched"})
+    print(f"{message}: {gist_data['html_url']}")
+    return entry
+
+async def main():
+    gist_entries = orjson.loads(Path(INPUT_FILE).read_bytes())
+
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    limiter = AsyncLimiter(RATE_LIMIT, RATE_PERIOD)
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    # HTTP/2 multiplexes the concurrent calls as streams over one TLS connection
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=30.0, limits=limits) as client:
+        # Entries are independent, so every call is in flight at once (bounded by sem).
+        # GitHub's GraphQL API exposes gists read-only (no createGist/updateGist/deleteGist),
+        # so writes cannot be batched into one mutation and stay one REST call per entry.
+        tasks = [asyncio.create_task(handle(entry, client, sem, limiter)) for entry in gist_entries]
+
+        # Stream each kept entry to a temp file, in input order, as its call completes,
+        # then swap it into place so a crash never leaves a truncated all-gists.json
+        # (and never leaves the half-written temp file behind either)
+        tmp_file = f"{OUTPUT_FILE}.tmp"
+        written = 0
+        try:
+            with open(tmp_file, "wb") as out:
+                out.write(b"[")
+                for task in tasks:
+                    entry = await task
+                    if entry is None:
+                        continue
+                    out.write(b",\n" if written else b"\n")
+                    out.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2))
+                    written += 1
+                out.write(b"\n]" if written else b"]")
+            os.replace(tmp_file, OUTPUT_FILE)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    print(f"\n📂 Gists written to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
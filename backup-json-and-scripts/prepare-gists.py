@@ -1,11 +1,12 @@
-import json
+import orjson
+from pathlib import Path
 from pprint import pprint
 
 GITHUB_REPO_FILE = "github-repo.json"
 
 all_gists = []
-with open(GITHUB_REPO_FILE, "r") as f:
-    data = json.load(f)
+with open(GITHUB_REPO_FILE, "rb") as f:
+    data = orjson.loads(f.read())
 
 
 for key,val in data.items():
@@ -26,6 +27,5 @@ for key,val in data.items():
         }
         all_gists.append(data)
 
-with open("gists.json", "w") as f:
-    json.dump(all_gists, f, indent=2, ensure_ascii=False)
-    print("📂 Gists written to gists.json")
+Path("gists.json").write_bytes(orjson.dumps(all_gists, option=orjson.OPT_INDENT_2))
+print("📂 Gists written to gists.json")
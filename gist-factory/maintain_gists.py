@@ -6,41 +6,76 @@ It can also perform a dry run to show what would be done without making any chan
 """
 
 import argparse
+import asyncio
 import os
 import sys
-import json
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterable, List, Optional
 from collections import Counter
-import requests
+from itertools import chain
+import httpx
+import orjson
 
 
 API_URL = "https://api.github.com/gists"
+# Maps a completed operation to its report status; anything else was not carried out
+_OP2STATUS = {
+    "deleted": "Deleted",
+    "updated": "Updated",
+    "created": "Created",
+}
+# Cap on in-flight API calls, kept low to stay under GitHub's secondary rate limit
+MAX_CONCURRENCY = 10
+# Per-request retries in request_with_retry; transport-level connect retries are separate
+RETRY_TOTAL = 5
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def jdumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize an object to a JSON string using orjson.
+
+    Args:
+        obj (Any): The object to serialize.
+        pretty (bool): Indent the output by two spaces when True.
+
+    Returns:
+        str: The JSON document as a string.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
+
+def print_items(items: Iterable[Dict[str, Any]]) -> None:
+    """
+    Pretty-print items as JSON documents with a single write to stdout.
+
+    Args:
+        items (Iterable[Dict[str, Any]]): The items to print.
+    """
+    lines = [jdumps(item, pretty=True) for item in items]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def get_status(item):
     """
-    Determines the status of an item based on its operation type or presence of an ID.
+    Determines the status of an item based on its completed operation.
     Args:
-        item (dict): A dictionary representing an item, which may contain the keys
-        'operation' and/or 'id'.
+        item (dict): A dictionary representing an item, which may contain the key
+        'operation'.
     Returns:
         str: The status of the item, which can be one of the following:
-            - "Deleted" if the operation is 'delete'
-            - "Updated" if the operation is 'update'
-            - "Created" if the operation is 'create'
-            - "Skipped" if the item has an 'id' key with a truthy value or if none of
-            the above conditions are met
+            - "Deleted" if the operation is 'deleted'
+            - "Updated" if the operation is 'updated'
+            - "Created" if the operation is 'created'
+            - "Skipped" otherwise, including items whose pending 'create',
+            'update' or 'delete' was not carried out (failed or dry run)
     """
 
-    if "operation" in item:
-        if item["operation"] == "delete":
-            return "Deleted"
-        elif item["operation"] == "update":
-            return "Updated"
-        elif item["operation"] == "create":
-            return "Created"
-    return "Skipped"
+    return _OP2STATUS.get(item.get("operation"), "Skipped")
 
 
 def get_headers(token: str) -> Dict[str, str]:
@@ -65,18 +100,80 @@ def get_headers(token: str) -> Dict[str, str]:
     return headers
 
 
+def is_retryable(resp: httpx.Response) -> bool:
+    """
+    Determine whether a response should be retried.
+
+    Args:
+        resp (httpx.Response): The response to inspect.
+
+    Returns:
+        bool: True for statuses in RETRY_STATUSES, and for a 403 that GitHub marks
+        as a (secondary) rate limit via Retry-After or X-RateLimit-Remaining: 0.
+    """
+    if resp.status_code in RETRY_STATUSES:
+        return True
+    return resp.status_code == 403 and (
+        "Retry-After" in resp.headers or resp.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """
+    Compute how long to wait before retrying a response.
+
+    Args:
+        resp (httpx.Response): The response being retried.
+        attempt (int): Zero-based attempt number, used for exponential backoff.
+
+    Returns:
+        float: Seconds to sleep. GitHub's own hint wins: Retry-After seconds, then
+        the X-RateLimit-Reset epoch when the quota is exhausted; otherwise
+        RETRY_BACKOFF * 2**attempt.
+    """
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return int(retry_after)
+    reset = resp.headers.get("X-RateLimit-Reset", "")
+    if resp.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        return max(int(reset) - time.time(), 0)
+    return RETRY_BACKOFF * 2**attempt
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a request, retrying rate-limited and transient server errors.
+
+    Args:
+        client (httpx.AsyncClient): The shared API client.
+        method (str): HTTP method, e.g. "POST".
+        url (str): Request URL.
+        **kwargs: Passed through to httpx.AsyncClient.request.
+
+    Returns:
+        httpx.Response: The first response that is not retryable (see is_retryable),
+        or the final attempt's response once RETRY_TOTAL retries are used up.
+    """
+    for attempt in range(RETRY_TOTAL + 1):
+        resp = await client.request(method, url, **kwargs)
+        if attempt == RETRY_TOTAL or not is_retryable(resp):
+            return resp
+        await asyncio.sleep(retry_delay(resp, attempt))
+
+
 def load_json(path: Path) -> List[Dict[str, Any]]:
     """
     Load a JSON file from the given path and return its contents as a list of dictionaries.
     Raises an error and exits if the file cannot be read or does not contain a list.
     """
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(path.read_bytes())
         if not isinstance(data, list):
             raise ValueError("Input JSON must be a list of gist items.")
         return data
-    except (OSError, json.JSONDecodeError) as e:
+    except (OSError, orjson.JSONDecodeError) as e:
         print(f"❌ Failed to read JSON from {path}: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -100,81 +197,89 @@ def parse_args():
     return parser.parse_args()
 
 
-def segregate_gists(
-    items: List[Dict[str, Any]],
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
-    """
-    Segregate items into:
-        - to_create: items without 'gist_id' and operation is 'create' or missing
-        - to_update: items with 'gist_id' and operation is 'update'
-        - to_delete: gist_ids from items with 'gist_id' and operation is 'delete'
-        - to_skip: items that do not match any of the above
-    """
-    to_create = []
-    to_update = []
-    to_delete = []
-    to_skip = []
+@dataclass(slots=True)
+class Buckets:
+    """
+    Gist items grouped by the action to perform on them.
+
+    Attributes:
+        create: items without 'gist_id' and operation is 'create' or missing
+        update: items with 'gist_id' and operation is 'update'
+        delete: items with 'gist_id' and operation is 'delete'
+        skip: items that do not match any of the above
+    """
+
+    create: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    delete: List[Dict[str, Any]] = field(default_factory=list)
+    skip: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def segregate_gists(items: Iterable[Dict[str, Any]]) -> Buckets:
+    """
+    Segregate items in a single pass over any iterable into the create,
+    update, delete and skip buckets (see Buckets).
+    """
+    buckets = Buckets()
     for item in items:
         gist_id = item.get("id")
-        operation = item.get("operation", None)
+        operation = item.get("operation")
         if operation == "delete" and gist_id:
-            to_delete.append(item)
+            buckets.delete.append(item)
         elif operation == "update" and gist_id:
-            to_update.append(item)
+            buckets.update.append(item)
         elif (operation == "create" or operation is None) and not gist_id:
-            to_create.append(item)
+            buckets.create.append(item)
         else:
-            to_skip.append(item)  # No operation, or unrecognized operation
-    return to_create, to_update, to_delete, to_skip
+            buckets.skip.append(item)  # No operation, or unrecognized operation
+    return buckets
 
 
-def create_gists(
-    session: requests.Session,
+async def create_gists(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
     items: List[Dict[str, Any]],
-    token: str,
     dry_run: bool = False,
     debug: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Create GitHub gists for the given items (dicts without 'gist_id').
     Updates each item in-place with the new 'gist_id' if creation succeeds.
+    Requests are issued concurrently, bounded by the shared semaphore.
     Returns the list of items with updated gist_ids.
     """
 
-    created_items = []
     if debug:
         print("First two gists to create:")
-        for item in items[:2]:
-            print(json.dumps(item, indent=2))
+        print_items(items[:2])
 
-    for idx, item in enumerate(items, start=1):
+    async def create_one(idx: int, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if "id" in item and item.get("id"):
             if debug:
                 print(f"[{idx}] Skipping item with existing id: {item['id']}")
-            continue
+            return None
 
+        # Encode the content once; the payload only references it
+        filename = item.get("filename", "untitled.json")
+        content_str = jdumps(item.get("content", {}), pretty=True)
         payload = {
-            "description": f'Gist for {item.get("filename", "untitled.json")}',
+            "description": f"Gist for {filename}",
             "public": False,
-            "files": {
-                item.get("filename", "untitled.json"): {
-                    "content": json.dumps(item.get("content", {}), indent=2)
-                }
-            },
+            "files": {filename: {"content": content_str}},
         }
         if not payload["files"]:
             print(
                 f"❌ [{idx}] No files specified for gist creation; skipping.",
                 file=sys.stderr,
             )
-            continue
+            return None
         if dry_run:
-            print(f"[DRY RUN] Would create gist: {json.dumps(payload, indent=2)}")
+            print(f"[DRY RUN] Would create gist: {jdumps(payload, pretty=True)}")
             print("===============================================================")
-            continue
+            return None
         try:
-            headers = get_headers(token)
-            resp = session.post(API_URL, headers=headers, json=payload, timeout=10)
+            async with sem:
+                resp = await request_with_retry(client, "POST", API_URL, json=payload)
             # Sample of the response object:
             # {
             #   "url": "https://api.github.com/gists/aa5a315d61ae9438b18d",
@@ -211,149 +316,164 @@ def create_gists(
                 gist_id = resp.json().get("id")
                 url = resp.json().get("url")
                 item.update({"id": gist_id, "operation": "created", "url": url})
-                created_items.append(item)
                 if debug:
                     print(f"✅ [{idx}] Created gist: {url}")
-            else:
-                print(
-                    f"❌ [{idx}] Failed to create gist: {resp.status_code} {resp.text}",
-                    file=sys.stderr,
-                )
-        except requests.RequestException as e:
+                return item
+            print(
+                f"❌ [{idx}] Failed to create gist: {resp.status_code} {resp.text}",
+                file=sys.stderr,
+            )
+        except httpx.HTTPError as e:
             print(
                 f"❌ [{idx}] Network error during gist creation: {e}", file=sys.stderr
             )
+        return None
+
+    results = await asyncio.gather(
+        *(create_one(idx, item) for idx, item in enumerate(items, start=1))
+    )
+    created_items = [item for item in results if item is not None]
 
     print(">>>>>>>>---------------------------------------------------------")
     print(f"Created {len(created_items)} gists.")
     print(">>>>>>>>---------------------------------------------------------")
-    print("Created gists:")
-    for item in created_items:
-        print(json.dumps(item, indent=2))
+    if debug:
+        print("Created gists:")
+        print_items(created_items)
 
     return created_items
 
 
-def update_gists(
-    session: requests.Session,
+async def update_gists(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
     items: List[Dict[str, Any]],
-    token: str,
     dry_run: bool = False,
     debug: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Update existing GitHub gists for the given items (dicts with 'gist_id').
+    Requests are issued concurrently, bounded by the shared semaphore.
     Returns the list of items that were successfully updated.
     """
 
-    updated_items = []
     if debug:
         print("First two gists to update:")
-        for item in items[:2]:
-            print(json.dumps(item, indent=2))
+        print_items(items[:2])
 
-    for idx, item in enumerate(items, start=1):
+    async def update_one(idx: int, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         gist_id = item.get("id")
         if not gist_id:
             if debug:
                 print(f"[{idx}] Skipping item without id.")
-            continue
+            return None
 
+        # Encode the content once; the payload only references it
+        filename = item.get("filename", "untitled.json")
+        content_str = jdumps(item.get("content", {}), pretty=True)
         payload = {
-            "description": f'Updated gist for {item.get("filename", "untitled.json")}',
-            "files": {
-                item.get("filename", "untitled.json"): {
-                    "content": json.dumps(item.get("content", {}), indent=2)
-                }
-            },
+            "description": f"Updated gist for {filename}",
+            "files": {filename: {"content": content_str}},
         }
-        print(payload)
         if not payload["files"]:
             print(
                 f"❌ [{idx}] No files specified for gist update; skipping.",
                 file=sys.stderr,
             )
-            continue
+            return None
         if dry_run:
             print(
-                f"[DRY RUN] Would update gist {gist_id}: {json.dumps(payload, indent=2)}"
+                f"[DRY RUN] Would update gist {gist_id}: {jdumps(payload, pretty=True)}"
             )
             print("===============================================================")
-            continue
+            return None
         try:
-            headers = get_headers(token)
-            resp = session.patch(
-                f"{API_URL}/{gist_id}", headers=headers, json=payload, timeout=10
-            )
+            async with sem:
+                resp = await request_with_retry(
+                    client, "PATCH", f"{API_URL}/{gist_id}", json=payload
+                )
             if resp.status_code == 200:
-                updated_items.append(item.update({"operation": "updated"}))
+                item.update({"operation": "updated"})
                 if debug:
                     gist_url = resp.json().get("html_url")
                     print(f"✅ [{idx}] Updated gist: {gist_url}")
-            else:
-                print(
-                    f"❌ [{idx}] Failed to update gist {gist_id}: {resp.status_code} {resp.text}",
-                    file=sys.stderr,
-                )
-        except requests.RequestException as e:
+                return item
+            print(
+                f"❌ [{idx}] Failed to update gist {gist_id}: {resp.status_code} {resp.text}",
+                file=sys.stderr,
+            )
+        except httpx.HTTPError as e:
             print(f"❌ [{idx}] Network error during gist update: {e}", file=sys.stderr)
+        return None
+
+    results = await asyncio.gather(
+        *(update_one(idx, item) for idx, item in enumerate(items, start=1))
+    )
+    updated_items = [item for item in results if item is not None]
 
     print(">>>>>>>>---------------------------------------------------------")
     print(f"Updated {len(updated_items)} gists.")
     print(">>>>>>>>---------------------------------------------------------")
-    print("Updated gists:")
-    for item in updated_items:
-        print(json.dumps(item, indent=2))
+    if debug:
+        print("Updated gists:")
+        print_items(updated_items)
 
     return updated_items
 
 
-def delete_gists(
-    session: requests.Session,
+async def delete_gists(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
     items: List[Dict[str, Any]],
-    token: str,
     dry_run: bool = False,
     debug: bool = False,
-) -> List[str]:
+) -> List[Dict[str, Any]]:
     """
-    Delete GitHub gists for the given gist IDs.
-    Returns the list of gist IDs that were successfully deleted.
+    Delete GitHub gists for the given items (dicts with 'gist_id').
+    Requests are issued concurrently, bounded by the shared semaphore.
+    Returns the list of items that were successfully deleted.
     """
 
-    deleted_items = []
     if debug:
         print("First two gists to delete:")
-        for item in items[:2]:
-            print(json.dumps(item, indent=2))
+        print_items(items[:2])
 
-    gist_ids = [item["id"] for item in items if "id" in item and item["id"]]
-    for idx, gist_id in enumerate(gist_ids, start=1):
+    async def delete_one(idx: int, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        gist_id = item["id"]
         if dry_run:
             print(f"[DRY RUN] Would delete gist {gist_id}")
             print("===============================================================")
-            continue
+            return None
         try:
-            headers = get_headers(token)
-            resp = session.delete(f"{API_URL}/{gist_id}", headers=headers, timeout=10)
+            async with sem:
+                resp = await request_with_retry(client, "DELETE", f"{API_URL}/{gist_id}")
             if resp.status_code == 204:
-                deleted_items.append(item.update({"operation": "deleted"}))
+                item.update({"operation": "deleted"})
                 if debug:
                     print(f"✅ [{idx}] Deleted gist: {gist_id}")
-            else:
-                print(
-                    f"❌ [{idx}] Failed to delete gist {gist_id}: {resp.status_code} {resp.text}",
-                    file=sys.stderr,
-                )
-        except requests.RequestException as e:
+                return item
+            print(
+                f"❌ [{idx}] Failed to delete gist {gist_id}: {resp.status_code} {resp.text}",
+                file=sys.stderr,
+            )
+        except httpx.HTTPError as e:
             print(
                 f"❌ [{idx}] Network error during gist deletion: {e}", file=sys.stderr
             )
+        return None
+
+    to_delete = [item for item in items if "id" in item and item["id"]]
+    results = await asyncio.gather(
+        *(delete_one(idx, item) for idx, item in enumerate(to_delete, start=1))
+    )
+    deleted_items = [item for item in results if item is not None]
+
     print(">>>>>>>>---------------------------------------------------------")
     print(f"Deleted {len(deleted_items)} gists.")
     print(">>>>>>>>---------------------------------------------------------")
-    print("Deleted gists:")
-    for item in deleted_items:
-        print(json.dumps(item, indent=2))
+    if debug:
+        print("Deleted gists:")
+        print_items(deleted_items)
 
     return deleted_items
 
@@ -367,9 +487,9 @@ def generate_gist_id_json(all_gists_path, gist_id_file_path, github_username):
         github_username (str): GitHub username for constructing raw_url.
     """
     try:
-        with all_gists_path.open("r", encoding="utf-8") as f:
-            gists = json.load(f)
-    except (OSError, json.JSONDecodeError) as e:
+        with all_gists_path.open("rb") as f:
+            gists = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
         print(f"Failed to read {all_gists_path}: {e}", file=sys.stderr)
         return
 
@@ -391,16 +511,15 @@ def generate_gist_id_json(all_gists_path, gist_id_file_path, github_username):
         gist_map[filename] = {"id": gist_id, "raw_url": raw_url}
 
     try:
-        with gist_id_file_path.open("w", encoding="utf-8") as f:
-            json.dump(gist_map, f, indent=2)
+        gist_id_file_path.write_bytes(orjson.dumps(gist_map, option=orjson.OPT_INDENT_2))
         print(f"Gist ID JSON written to {gist_id_file_path}")
     except (OSError, IOError) as e:
         print(f"Failed to write {gist_id_file_path}: {e}", file=sys.stderr)
 
 
-def main():
+async def amain():
     """
-    Main entry point for the script.
+    Async entry point for the script.
     Parses command-line arguments to manage GitHub gists based on a JSON file.
     Supports creating, updating, and deleting gists, as well as skipping existing ones.
     Handles dry-run and debug modes for validation and verbose output.
@@ -481,7 +600,7 @@ def main():
         )
         items = load_json(input_path)
 
-    except (OSError, json.JSONDecodeError) as e:
+    except (OSError, orjson.JSONDecodeError) as e:
         print(f"Failed to load input JSON: {e}", file=sys.stderr)
         sys.exit(1)
 
@@ -492,58 +611,75 @@ def main():
         print(str(e), file=sys.stderr)
         sys.exit(1)
 
-    session = requests.Session()
-
-    to_create, to_update, to_delete, to_skip = segregate_gists(items)
+    buckets = segregate_gists(items)
     if getattr(args, "debug", False):
-        print(f"To create: {len(to_create)}")
-        print(f"To update: {len(to_update)}")
-        print(f"To delete: {len(to_delete)}")
-        print(f"To skip: {len(to_skip)}")
-
-    if to_create:
-        created_items = create_gists(
-            session,
-            to_create,
-            args.token or os.getenv("GITHUB_TOKEN"),
-            dry_run=args.dry_run,
-            debug=args.debug,
-        )
+        print(f"To create: {len(buckets.create)}")
+        print(f"To update: {len(buckets.update)}")
+        print(f"To delete: {len(buckets.delete)}")
+        print(f"To skip: {len(buckets.skip)}")
+
+    # One HTTP/2 client shared across the create, update and delete phases;
+    # concurrent calls are multiplexed over a single TLS connection, and the
+    # transport retries failed connection attempts
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=RETRY_TOTAL,
+        limits=httpx.Limits(max_connections=20),
+    )
+    async with httpx.AsyncClient(
+        transport=transport,
+        headers=get_headers(args.token or os.getenv("GITHUB_TOKEN")),
+        timeout=10,
+    ) as client:
+        # Phases run in order (create -> update -> delete) so an update and a
+        # delete of the same gist id land in that order; each phase is
+        # concurrent internally, bounded by the shared semaphore
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        created_items: List[Dict[str, Any]] = []
+        updated_items: List[Dict[str, Any]] = []
+        deleted_items: List[Dict[str, Any]] = []
+        if buckets.create:
+            created_items = await create_gists(
+                client,
+                sem,
+                buckets.create,
+                dry_run=args.dry_run,
+                debug=args.debug,
+            )
 
-    if to_update:
-        updated_items = update_gists(
-            session,
-            to_update,
-            args.token or os.getenv("GITHUB_TOKEN"),
-            dry_run=args.dry_run,
-            debug=args.debug,
-        )
+        if buckets.update:
+            updated_items = await update_gists(
+                client,
+                sem,
+                buckets.update,
+                dry_run=args.dry_run,
+                debug=args.debug,
+            )
 
-    if to_delete:
-        deleted_items = delete_gists(
-            session,
-            to_delete,
-            args.token or os.getenv("GITHUB_TOKEN"),
-            dry_run=args.dry_run,
-            debug=args.debug,
-        )
+        if buckets.delete:
+            deleted_items = await delete_gists(
+                client,
+                sem,
+                buckets.delete,
+                dry_run=args.dry_run,
+                debug=args.debug,
+            )
 
-    # Merge created_items, updated_items, and to_skip if their lengths are more than 0
-    merged_items = []
-    if to_create and len(created_items) > 0:
-        merged_items.extend(created_items)
-    if to_update and len(updated_items) > 0:
-        merged_items.extend(updated_items)
-    if len(to_skip) > 0:
-        merged_items.extend(to_skip)
-    if len(to_delete) > 0 and len(deleted_items) == 0:
-        merged_items.extend(to_delete)
+    # Merge created, updated and skipped items, keeping any gist whose delete
+    # did not go through (failed or dry run) so it is not lost from the output
+    merged_items = list(
+        chain(
+            created_items,
+            updated_items,
+            buckets.skip,
+            (item for item in buckets.delete if item.get("operation") != "deleted"),
+        )
+    )
 
     print("=" * 60)
     if getattr(args, "debug", False):
         print("Merged items:")
-        for item in merged_items:
-            print(json.dumps(item, indent=2))
+        print_items(merged_items)
 
     # Write the updated items back to the output file
     if not merged_items:
@@ -552,20 +688,25 @@ def main():
     else:
         print(f"Writing the file {output_path} ")
         try:
-            with output_path.open("w", encoding="utf-8") as f:
-                json.dump(merged_items, f, indent=2)
+            output_path.write_bytes(
+                orjson.dumps(merged_items, option=orjson.OPT_INDENT_2)
+            )
             print(f"Updated items written to {output_path}")
         except OSError as e:
             print(f"Failed to write output JSON: {e}", file=sys.stderr)
             sys.exit(1)
 
     # If merged_items is not empty, generate a JSON report
-    if "deleted_items" in locals() and deleted_items:
-        print(f"Deleted items : {deleted_items} gists.")
+    if deleted_items:
+        if args.debug:
+            print(f"Deleted items : {deleted_items} gists.")
         merged_items.extend(deleted_items)
     if merged_items:
+        # Build the report rows and tally statuses in a single pass
         report = []
+        status_counts = Counter()
         for item in merged_items:
+            status_counts[get_status(item)] += 1
             report.append(
             {
                 "id": item.get("id", "-"),
@@ -578,19 +719,19 @@ def main():
 
         # Write JSON report for GitHub Action step
         try:
-            with report_path.open("w", encoding="utf-8") as f:
-                json.dump(report, f, indent=2)
+            report_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
             print(f"Gist operation report written to {report_path}")
         except OSError as e:
             print(f"Failed to write gist operation report: {e}", file=sys.stderr)
 
         # Print summary
-        # status_counts = Counter(item["status"] for item in report)
-        # print("Summary:")
-        # print(status_counts)
-        # for status in ["Created", "Updated", "Deleted", "Skipped"]:
-        #     print(f"  {status}: {status_counts.get(status, 0)}")
-        # print("=" * 60)
+        lines = ["Summary:"]
+        lines.extend(
+            f"  {status}: {status_counts.get(status, 0)}"
+            for status in ["Created", "Updated", "Deleted", "Skipped"]
+        )
+        lines.append("=" * 60)
+        sys.stdout.write("\n".join(lines) + "\n")
 
         # generate gist_id.json:
         gist_id_file_path = Path(gist_id_file).expanduser().resolve()
@@ -601,5 +742,12 @@ def main():
         )
 
 
+def main():
+    """
+    Main entry point for the script. Runs amain() on a fresh event loop.
+    """
+    asyncio.run(amain())
+
+
 if __name__ == "__main__":
     main()